@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import inspect
 import json
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from typing import Any, Iterable, Sequence
 
 from .grid import Grid
-from .heuristics import DEFAULT_HEURISTICS, Heuristic, HeuristicResult, TrainingPair
+from .heuristics import DEFAULT_HEURISTICS, Heuristic, HeuristicResult, TaskFeatures, TrainingPair
 
 
 @dataclass(frozen=True)
@@ -17,7 +18,7 @@ class SolutionCandidate:
     confidence: float
     rationale: str
 
-    def serialise(self) -> dict:
+    def serialise(self) -> dict[str, Any]:
         return {
             "heuristic": self.heuristic,
             "confidence": self.confidence,
@@ -32,7 +33,7 @@ class Task:
     tests: tuple[Grid, ...]
 
     @staticmethod
-    def from_dict(payload: dict) -> "Task":
+    def from_dict(payload: dict[str, Any]) -> "Task":
         training_pairs = []
         for entry in payload.get("training", []):
             training_pairs.append(
@@ -50,17 +51,24 @@ class ArcSolverAgent:
 
     def __init__(self, heuristics: Iterable[Heuristic] | None = None) -> None:
         self.heuristics = tuple(heuristics or DEFAULT_HEURISTICS)
+        self._takes_features = tuple(_accepts_features(heuristic) for heuristic in self.heuristics)
 
     def analyse(self, task: Task) -> list[SolutionCandidate]:
         candidates: list[SolutionCandidate] = []
-        for heuristic in self.heuristics:
-            result = self._apply_heuristic(heuristic, task.training, task.tests)
+        features = TaskFeatures.from_pairs(task.training)
+        for heuristic, takes_features in zip(self.heuristics, self._takes_features):
+            result = self._apply_heuristic(
+                heuristic,
+                task.training,
+                task.tests,
+                features if takes_features else None,
+            )
             if result:
                 candidates.append(result)
         candidates.sort(key=lambda c: c.confidence, reverse=True)
         return candidates
 
-    def solve(self, payload: dict | Task) -> dict:
+    def solve(self, payload: dict[str, Any] | Task) -> dict[str, Any]:
         task = payload if isinstance(payload, Task) else Task.from_dict(payload)
         candidates = self.analyse(task)
         return {
@@ -72,8 +80,13 @@ class ArcSolverAgent:
         heuristic: Heuristic,
         training: Sequence[TrainingPair],
         tests: Sequence[Grid],
+        features: TaskFeatures | None = None,
     ) -> SolutionCandidate | None:
-        result: HeuristicResult | None = heuristic.infer(training)
+        result: HeuristicResult | None
+        if features is None:
+            result = heuristic.infer(training)
+        else:
+            result = heuristic.infer(training, features)
         if result is None:
             return None
         outputs = tuple(result.transform(grid) for grid in tests)
@@ -91,4 +104,16 @@ class ArcSolverAgent:
         return Task.from_dict(payload)
 
 
+def _accepts_features(heuristic: Heuristic) -> bool:
+    """Whether ``heuristic.infer`` takes the shared ``features`` argument."""
+
+    try:
+        parameters = inspect.signature(heuristic.infer).parameters
+    except (TypeError, ValueError):  # pragma: no cover - uninspectable callables
+        return False
+    return "features" in parameters or any(
+        parameter.kind is inspect.Parameter.VAR_POSITIONAL for parameter in parameters.values()
+    )
+
+
 __all__ = ["ArcSolverAgent", "SolutionCandidate", "Task"]
@@ -2,51 +2,121 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import Iterable, Iterator, Sequence
 
+import numpy as np
+
 
 Coordinate = tuple[int, int]
+_IntSet = set[int]
+
+MAX_COLOR = 255
 
 
-@dataclass(frozen=True)
 class Grid:
-    """Immutable wrapper around a 2D grid of colour indices."""
+    """Immutable wrapper around a 2D grid of colour indices.
+
+    Pixels are stored in a read-only, C-contiguous ``uint8`` array of shape
+    ``(height, width)``, i.e. one flat byte buffer with a row stride of ``width``.
+    """
 
-    data: tuple[tuple[int, ...], ...]
+    __slots__ = ("_arr", "_data", "_hash", "_hist")
 
-    def __post_init__(self) -> None:  # pragma: no cover - dataclass hook
-        height = len(self.data)
-        if height == 0:
+    _arr: np.ndarray
+    _data: tuple[tuple[int, ...], ...] | None
+    _hash: int | None
+    _hist: np.ndarray | None
+
+    def __init__(self, data: Sequence[Sequence[int]] | np.ndarray) -> None:
+        try:
+            arr = np.array(data)
+        except ValueError as exc:
+            raise ValueError("Grid rows must be equal length") from exc
+        if arr.size == 0:
             raise ValueError("Grid cannot be empty")
-        width = len(self.data[0])
-        for row in self.data:
-            if len(row) != width:
-                raise ValueError("Grid rows must be equal length")
-            for value in row:
-                if not isinstance(value, int):
-                    raise TypeError("Grid values must be integers")
-                if value < 0:
-                    raise ValueError("Grid values must be non-negative")
+        if arr.ndim != 2:
+            raise ValueError("Grid rows must be equal length")
+        if arr.dtype.kind not in "biu":
+            raise TypeError("Grid values must be integers")
+        if arr.min() < 0:
+            raise ValueError("Grid values must be non-negative")
+        if arr.max() > MAX_COLOR:
+            raise ValueError(f"Grid values must not exceed {MAX_COLOR}")
+        self._init(arr.astype(np.uint8))
+
+    def _init(self, arr: np.ndarray) -> None:
+        arr = np.ascontiguousarray(arr)
+        arr.setflags(write=False)
+        object.__setattr__(self, "_arr", arr)
+        object.__setattr__(self, "_data", None)
+        object.__setattr__(self, "_hash", None)
+        object.__setattr__(self, "_hist", None)
+
+    @classmethod
+    def _from_array(cls, arr: np.ndarray) -> "Grid":
+        """Wrap a ``uint8`` array produced by another grid without validating it."""
+
+        assert arr.dtype == np.uint8 and arr.ndim == 2 and arr.size, "malformed grid array"
+        grid = cls.__new__(cls)
+        grid._init(arr)
+        return grid
 
     @staticmethod
     def from_list(data: Sequence[Sequence[int]]) -> "Grid":
-        """Create a grid from a 2D list or tuple."""
+        """Create a grid from a 2D list or tuple, coercing each value with ``int``."""
+
+        try:
+            arr = np.asarray(data)
+        except ValueError:
+            arr = None
+        if arr is not None and arr.dtype.kind in "biu":
+            return Grid(arr)
+        return Grid([[int(v) for v in row] for row in data])
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Grid is immutable")
 
-        return Grid(tuple(tuple(int(v) for v in row) for row in data))
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Grid is immutable")
+
+    def __reduce__(self) -> tuple[type["Grid"], tuple[np.ndarray]]:
+        return Grid, (self._arr,)
+
+    @property
+    def data(self) -> tuple[tuple[int, ...], ...]:
+        """Nested tuple view of the pixels, built on first access."""
+
+        data = self._data
+        if data is None:
+            data = tuple(tuple(row) for row in self._arr.tolist())
+            object.__setattr__(self, "_data", data)
+        return data
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.equals(other)
+
+    def __hash__(self) -> int:
+        value = self._hash
+        if value is None:
+            value = hash((self._arr.shape, self._arr.tobytes()))
+            object.__setattr__(self, "_hash", value)
+        return value
 
     def to_list(self) -> list[list[int]]:
         """Return a mutable list representation of the grid."""
 
-        return [list(row) for row in self.data]
+        rows: list[list[int]] = self._arr.tolist()
+        return rows
 
     @property
     def height(self) -> int:
-        return len(self.data)
+        return int(self._arr.shape[0])
 
     @property
     def width(self) -> int:
-        return len(self.data[0])
+        return int(self._arr.shape[1])
 
     def __iter__(self) -> Iterator[tuple[int, ...]]:  # pragma: no cover - delegate
         return iter(self.data)
@@ -54,112 +124,129 @@ class Grid:
     def cells(self) -> Iterator[tuple[Coordinate, int]]:
         """Iterate over coordinates and values."""
 
-        for y, row in enumerate(self.data):
+        for y, row in enumerate(self._arr.tolist()):
             for x, value in enumerate(row):
                 yield (x, y), value
 
     def get(self, x: int, y: int) -> int:
-        return self.data[y][x]
+        return int(self._arr[y, x])
 
     def set(self, x: int, y: int, value: int) -> "Grid":
-        rows = [list(row) for row in self.data]
-        rows[y][x] = value
-        return Grid.from_list(rows)
+        _check_color(value)
+        arr = self._arr.copy()
+        arr[y, x] = value
+        return Grid._from_array(arr)
 
     def map_colors(self, mapping: dict[int, int], default: int | None = None) -> "Grid":
         """Map colours according to ``mapping`` leaving others untouched."""
 
-        rows = []
-        for row in self.data:
-            rows.append([
-                mapping.get(value, default if default is not None else value)
-                for value in row
-            ])
-        return Grid.from_list(rows)
+        return self.apply_lut(color_lut(mapping, default))
+
+    def apply_lut(self, lut: np.ndarray) -> "Grid":
+        """Recolour every pixel through a table built by :func:`color_lut`."""
+
+        return Grid._from_array(lut[self._arr])
 
     def transpose(self) -> "Grid":
-        return Grid(tuple(tuple(row[y] for row in self.data) for y in range(self.width)))
+        return Grid._from_array(self._arr.T)
 
     def mirror_horizontal(self) -> "Grid":
-        return Grid(tuple(tuple(reversed(row)) for row in self.data))
+        return Grid._from_array(self._arr[:, ::-1])
 
     def mirror_vertical(self) -> "Grid":
-        return Grid(tuple(reversed(self.data)))
+        return Grid._from_array(self._arr[::-1])
 
     def rotate_right(self) -> "Grid":
-        return Grid(tuple(tuple(self.data[self.height - 1 - y][x] for y in range(self.height)) for x in range(self.width)))
+        return Grid._from_array(np.rot90(self._arr, -1))
 
     def crop(self, left: int, top: int, right: int, bottom: int) -> "Grid":
-        rows = [row[left:right] for row in self.data[top:bottom]]
-        return Grid(tuple(tuple(row) for row in rows))
+        arr = self._arr[top:bottom, left:right]
+        if arr.size == 0:
+            raise ValueError("Grid cannot be empty")
+        return Grid._from_array(arr)
 
     def pad(self, padding: int, value: int = 0) -> "Grid":
-        width = self.width + 2 * padding
-        top_bottom = tuple((value,) * width for _ in range(padding))
-        body = []
-        for row in self.data:
-            body.append(tuple([value] * padding + list(row) + [value] * padding))
-        return Grid(top_bottom + tuple(body) + top_bottom)
+        _check_color(value)
+        return Grid._from_array(np.pad(self._arr, padding, constant_values=value))
 
     def replace_color(self, target: int, replacement: int) -> "Grid":
         return self.map_colors({target: replacement})
 
+    def _histogram(self) -> np.ndarray:
+        """Per-colour pixel counts, computed once per grid."""
+
+        hist = self._hist
+        if hist is None:
+            hist = np.bincount(self._arr.ravel(), minlength=10)
+            hist.setflags(write=False)
+            object.__setattr__(self, "_hist", hist)
+        return hist
+
     def count(self, value: int) -> int:
-        return sum(1 for _, cell in self.cells() if cell == value)
+        hist = self._histogram()
+        return int(hist[value]) if 0 <= value < len(hist) else 0
 
-    def colors(self) -> set[int]:
-        return {cell for _, cell in self.cells()}
+    def colors(self) -> _IntSet:
+        return set(np.flatnonzero(self._histogram()).tolist())
 
     def most_common_color(self) -> int:
-        counts: dict[int, int] = {}
-        for _, value in self.cells():
-            counts[value] = counts.get(value, 0) + 1
-        return max(counts, key=counts.get)
+        """Most frequent colour; ties go to the colour seen first in raster order."""
+
+        hist = self._histogram()
+        tied = hist == hist.max()
+        if np.count_nonzero(tied) == 1:
+            return int(hist.argmax())
+        flat = self._arr.ravel()
+        return int(flat[tied[flat]][0])
 
     def difference(self, other: "Grid") -> list[tuple[Coordinate, int, int]]:
         if self.width != other.width or self.height != other.height:
             raise ValueError("Grid sizes differ")
-        diff: list[tuple[Coordinate, int, int]] = []
-        for (coord, value_self), (_, value_other) in zip(self.cells(), other.cells()):
-            if value_self != value_other:
-                diff.append((coord, value_self, value_other))
-        return diff
+        ys, xs = np.nonzero(self._arr != other._arr)
+        return [
+            ((x, y), self_value, other_value)
+            for x, y, self_value, other_value in zip(
+                xs.tolist(),
+                ys.tolist(),
+                self._arr[ys, xs].tolist(),
+                other._arr[ys, xs].tolist(),
+            )
+        ]
 
     def equals(self, other: "Grid") -> bool:
-        return self.data == other.data
+        if self is other:
+            return True
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
+        return np.array_equal(self._arr, other._arr)
 
     def flatten(self) -> tuple[int, ...]:
-        return tuple(value for _, value in self.cells())
+        return tuple(self._arr.ravel().tolist())
 
     def resize(self, scale_x: int, scale_y: int) -> "Grid":
         if scale_x <= 0 or scale_y <= 0:
             raise ValueError("Scale must be positive")
-        rows = []
-        for row in self.data:
-            expanded_row = []
-            for value in row:
-                expanded_row.extend([value] * scale_x)
-            for _ in range(scale_y):
-                rows.append(tuple(expanded_row))
-        return Grid(tuple(rows))
+        if scale_x == 1 and scale_y == 1:
+            return self
+        return Grid._from_array(np.repeat(np.repeat(self._arr, scale_y, axis=0), scale_x, axis=1))
 
     def paste(self, other: "Grid", offset: Coordinate) -> "Grid":
         ox, oy = offset
-        rows = [list(row) for row in self.data]
-        for (x, y), value in other.cells():
-            tx, ty = x + ox, y + oy
-            if 0 <= tx < self.width and 0 <= ty < self.height:
-                rows[ty][tx] = value
-        return Grid.from_list(rows)
+        left, top = max(0, ox), max(0, oy)
+        right, bottom = min(self.width, ox + other.width), min(self.height, oy + other.height)
+        if left >= right or top >= bottom:
+            return self
+        arr = self._arr.copy()
+        arr[top:bottom, left:right] = other._arr[top - oy:bottom - oy, left - ox:right - ox]
+        return Grid._from_array(arr)
 
     def bounding_box(self, color_filter: Iterable[int] | None = None) -> tuple[int, int, int, int] | None:
-        colors = set(color_filter) if color_filter is not None else None
-        coords = [coord for coord, value in self.cells() if colors is None or value in colors]
-        if not coords:
+        if color_filter is None:
+            return 0, 0, self.width, self.height
+        ys, xs = np.nonzero(np.isin(self._arr, list(color_filter)))
+        if xs.size == 0:
             return None
-        xs = [c[0] for c in coords]
-        ys = [c[1] for c in coords]
-        return min(xs), min(ys), max(xs) + 1, max(ys) + 1
+        return int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1
 
     def subgrid(self, bbox: tuple[int, int, int, int]) -> "Grid":
         left, top, right, bottom = bbox
@@ -176,6 +263,29 @@ class Grid:
         return f"Grid(width={self.width}, height={self.height})"
 
 
+def _check_color(value: int) -> None:
+    if not 0 <= value <= MAX_COLOR:
+        raise ValueError(f"Colours must be between 0 and {MAX_COLOR}")
+
+
+def color_lut(mapping: dict[int, int], default: int | None = None) -> np.ndarray:
+    """Compile a colour mapping into a lookup table indexed by colour.
+
+    Colours missing from ``mapping`` keep their value unless ``default`` is given.
+    """
+
+    if default is None:
+        lut = np.arange(MAX_COLOR + 1, dtype=np.int64)
+    else:
+        lut = np.full(MAX_COLOR + 1, default, dtype=np.int64)
+    for source, target in mapping.items():
+        if 0 <= source <= MAX_COLOR:
+            lut[source] = target
+    _check_color(int(lut.min()))
+    _check_color(int(lut.max()))
+    return lut.astype(np.uint8)
+
+
 def grid_from_data(data: Sequence[Sequence[int]]) -> Grid:
     return Grid.from_list(data)
 
@@ -3,15 +3,70 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Callable, Sequence
 
-from .grid import Grid
-from .objects import extract_objects, difference_objects
+import numpy as np
+
+from .grid import Grid, color_lut
+from .objects import Object, extract_objects, difference_objects, translate
 
 Transform = Callable[[Grid], Grid]
 TrainingPair = tuple[Grid, Grid]
 
 
+@dataclass(frozen=True)
+class PairFeatures:
+    """Per training pair measurements shared by every heuristic.
+
+    Everything beyond the shape check is computed on first access.
+    """
+
+    src: Grid
+    dst: Grid
+    same_shape: bool
+
+    @staticmethod
+    def from_pair(pair: TrainingPair) -> "PairFeatures":
+        src, dst = pair
+        return PairFeatures(src=src, dst=dst, same_shape=src._arr.shape == dst._arr.shape)
+
+    @cached_property
+    def src_bg(self) -> int:
+        return self.src.most_common_color()
+
+    @cached_property
+    def dst_bg(self) -> int:
+        return self.dst.most_common_color()
+
+    @cached_property
+    def src_colors(self) -> frozenset[int]:
+        return frozenset(self.src.colors())
+
+    @cached_property
+    def dst_colors(self) -> frozenset[int]:
+        return frozenset(self.dst.colors())
+
+    @cached_property
+    def src_objs(self) -> list[Object]:
+        return extract_objects(self.src, self.src_bg)
+
+    @cached_property
+    def dst_objs(self) -> list[Object]:
+        return extract_objects(self.dst, self.dst_bg)
+
+
+@dataclass(frozen=True)
+class TaskFeatures:
+    """Features of all training pairs, computed once per task."""
+
+    pairs: tuple[PairFeatures, ...]
+
+    @staticmethod
+    def from_pairs(pairs: Sequence[TrainingPair]) -> "TaskFeatures":
+        return TaskFeatures(tuple(PairFeatures.from_pair(pair) for pair in pairs))
+
+
 @dataclass(frozen=True)
 class HeuristicResult:
     name: str
@@ -23,9 +78,17 @@ class HeuristicResult:
 class Heuristic:
     name: str = "heuristic"
 
-    def infer(self, pairs: Sequence[TrainingPair]) -> HeuristicResult | None:
+    def infer(
+        self,
+        pairs: Sequence[TrainingPair],
+        features: TaskFeatures | None = None,
+    ) -> HeuristicResult | None:
         raise NotImplementedError
 
+    @staticmethod
+    def _features(pairs: Sequence[TrainingPair], features: TaskFeatures | None) -> TaskFeatures:
+        return features if features is not None else TaskFeatures.from_pairs(pairs)
+
     def _success(self, transform: Transform, confidence: float, rationale: str) -> HeuristicResult:
         return HeuristicResult(self.name, transform, confidence, rationale)
 
@@ -33,7 +96,11 @@ class Heuristic:
 class IdentityHeuristic(Heuristic):
     name = "identity"
 
-    def infer(self, pairs: Sequence[TrainingPair]) -> HeuristicResult | None:
+    def infer(
+        self,
+        pairs: Sequence[TrainingPair],
+        features: TaskFeatures | None = None,
+    ) -> HeuristicResult | None:
         for src, dst in pairs:
             if not src.equals(dst):
                 return None
@@ -45,10 +112,14 @@ class IdentityHeuristic(Heuristic):
 class ConstantFillHeuristic(Heuristic):
     name = "constant-fill"
 
-    def infer(self, pairs: Sequence[TrainingPair]) -> HeuristicResult | None:
+    def infer(
+        self,
+        pairs: Sequence[TrainingPair],
+        features: TaskFeatures | None = None,
+    ) -> HeuristicResult | None:
         colour = None
-        for _, dst in pairs:
-            colours = dst.colors()
+        for feature in self._features(pairs, features).pairs:
+            colours = feature.dst_colors
             if len(colours) != 1:
                 return None
             candidate = next(iter(colours))
@@ -59,78 +130,96 @@ class ConstantFillHeuristic(Heuristic):
         if colour is None:
             return None
         def transform(grid: Grid) -> Grid:
-            return Grid(tuple(tuple(colour for _ in range(grid.width)) for _ in range(grid.height)))
+            return Grid._from_array(np.full(grid._arr.shape, colour, dtype=np.uint8))
         return self._success(transform, 0.1, f"Outputs collapse to a single colour {colour}.")
 
 
 class ColourMappingHeuristic(Heuristic):
     name = "colour-mapping"
 
-    def infer(self, pairs: Sequence[TrainingPair]) -> HeuristicResult | None:
+    def infer(
+        self,
+        pairs: Sequence[TrainingPair],
+        features: TaskFeatures | None = None,
+    ) -> HeuristicResult | None:
         mapping: dict[int, int] = {}
-        for src, dst in pairs:
-            if src.width != dst.width or src.height != dst.height:
+        for feature in self._features(pairs, features).pairs:
+            if not feature.same_shape:
                 return None
-            for (_, value_src), (_, value_dst) in zip(src.cells(), dst.cells()):
-                existing = mapping.get(value_src)
-                if existing is None:
-                    mapping[value_src] = value_dst
-                elif existing != value_dst:
+            src, dst = feature.src, feature.dst
+            pairs_seen, first_seen = np.unique(
+                np.stack((src._arr.ravel(), dst._arr.ravel()), axis=1),
+                axis=0,
+                return_index=True,
+            )
+            if len(pairs_seen) != len(np.unique(pairs_seen[:, 0])):
+                return None
+            for value_src, value_dst in pairs_seen[np.argsort(first_seen)].tolist():
+                if mapping.setdefault(value_src, value_dst) != value_dst:
                     return None
         if not mapping:
             return None
+        lut = color_lut(mapping)
         def transform(grid: Grid) -> Grid:
-            return grid.map_colors(mapping)
+            return grid.apply_lut(lut)
         return self._success(transform, 0.4, f"Pixel-wise colour remapping {mapping} fits all examples.")
 
 
 class BackgroundColourHeuristic(Heuristic):
     name = "background-colour"
 
-    def infer(self, pairs: Sequence[TrainingPair]) -> HeuristicResult | None:
+    def infer(
+        self,
+        pairs: Sequence[TrainingPair],
+        features: TaskFeatures | None = None,
+    ) -> HeuristicResult | None:
         bg = None
         fg = None
-        for src, dst in pairs:
-            if src.width != dst.width or src.height != dst.height:
+        for feature in self._features(pairs, features).pairs:
+            if not feature.same_shape:
                 return None
-            if len(dst.colors()) != 2:
+            if len(feature.dst_colors) != 2:
                 return None
-            src_bg = src.most_common_color()
-            dst_bg = dst.most_common_color()
+            pair_bg = (feature.src_bg, feature.dst_bg)
             if bg is None:
-                bg = (src_bg, dst_bg)
-            elif bg != (src_bg, dst_bg):
-                return None
-            for (_, value_src), (_, value_dst) in zip(src.cells(), dst.cells()):
-                if value_src != src_bg:
-                    if fg is None:
-                        fg = value_dst
-                    elif fg != value_dst:
-                        return None
+                bg = pair_bg
+            elif bg != pair_bg:
+                return None
+            foreground = np.unique(feature.dst._arr[feature.src._arr != feature.src_bg]).tolist()
+            if len(foreground) > 1:
+                return None
+            for value_dst in foreground:
+                if fg is None:
+                    fg = value_dst
+                elif fg != value_dst:
+                    return None
         if bg is None or fg is None:
             return None
         src_bg, dst_bg = bg
+        lut = color_lut({src_bg: dst_bg}, default=fg)
         def transform(grid: Grid) -> Grid:
-            mapping = {src_bg: dst_bg}
-            return grid.map_colors(mapping, default=fg)
+            return grid.apply_lut(lut)
         return self._success(transform, 0.35, f"Map background {src_bg}->{dst_bg} while foreground becomes {fg}.")
 
 
 class TranslationHeuristic(Heuristic):
     name = "object-translation"
 
-    def infer(self, pairs: Sequence[TrainingPair]) -> HeuristicResult | None:
+    def infer(
+        self,
+        pairs: Sequence[TrainingPair],
+        features: TaskFeatures | None = None,
+    ) -> HeuristicResult | None:
         vector = None
         background = None
-        for src, dst in pairs:
-            background_src = src.most_common_color()
-            background_dst = dst.most_common_color()
+        for feature in self._features(pairs, features).pairs:
+            pair_bg = (feature.src_bg, feature.dst_bg)
             if background is None:
-                background = (background_src, background_dst)
-            elif background != (background_src, background_dst):
+                background = pair_bg
+            elif background != pair_bg:
                 return None
-            src_objs = extract_objects(src, background_src)
-            dst_objs = extract_objects(dst, background_dst)
+            src_objs = feature.src_objs
+            dst_objs = feature.dst_objs
             if len(src_objs) != 1 or len(dst_objs) != 1:
                 return None
             match = difference_objects(src_objs, dst_objs)
@@ -148,31 +237,26 @@ class TranslationHeuristic(Heuristic):
             objs = extract_objects(grid, src_bg)
             if len(objs) != 1:
                 return grid
-            obj = objs[0]
-            canvas = [[dst_bg for _ in range(grid.width)] for _ in range(grid.height)]
-            for (x, y), value in grid.cells():
-                if (x, y) not in obj.pixels:
-                    canvas[y][x] = value
-            for x, y in obj.pixels:
-                nx, ny = x + vector[0], y + vector[1]
-                if 0 <= nx < grid.width and 0 <= ny < grid.height:
-                    canvas[ny][nx] = grid.get(x, y)
-            return Grid.from_list(canvas)
+            return translate(grid, objs[0], vector[0], vector[1], dst_bg)
         return self._success(transform, 0.5, f"Single foreground object translates by {vector}.")
 
 
 class ScaleReplicationHeuristic(Heuristic):
     name = "scale-replication"
 
-    def infer(self, pairs: Sequence[TrainingPair]) -> HeuristicResult | None:
+    def infer(
+        self,
+        pairs: Sequence[TrainingPair],
+        features: TaskFeatures | None = None,
+    ) -> HeuristicResult | None:
         scale_x = scale_y = None
         for src, dst in pairs:
             if dst.width % src.width != 0 or dst.height % src.height != 0:
                 return None
             candidate_x = dst.width // src.width
             candidate_y = dst.height // src.height
-            expanded = src.resize(candidate_x, candidate_y)
-            if not expanded.equals(dst):
+            blocks = dst._arr.reshape(src.height, candidate_y, src.width, candidate_x)
+            if not (blocks == src._arr[:, None, :, None]).all():
                 return None
             if scale_x is None:
                 scale_x = candidate_x
@@ -2,35 +2,76 @@
 
 from __future__ import annotations
 
-from collections import Counter, deque
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from functools import cached_property
+from typing import Sequence
+
+import numpy as np
+from scipy import ndimage
 
 from .grid import Coordinate, Grid
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Object:
-    """Connected set of coloured pixels."""
+    """Connected set of coloured pixels.
+
+    ``pixels`` is an ``(N, 2)`` array of ``(x, y)`` coordinates and ``shape`` the
+    ``(height, width)`` of the grid the object lives in. ``color_sig`` holds the
+    raw bytes of the object's per-colour pixel counts.
+    """
 
-    pixels: frozenset[Coordinate]
-    colors: Counter
+    pixels: np.ndarray
+    color_sig: bytes
     bounding_box: tuple[int, int, int, int]
     anchor: Coordinate
+    shape: tuple[int, int]
+
+    @cached_property
+    def colors(self) -> Counter[int]:
+        counts = np.frombuffer(self.color_sig, dtype=np.intp)
+        return Counter({colour: int(counts[colour]) for colour in np.flatnonzero(counts).tolist()})
+
+    @cached_property
+    def mask(self) -> np.ndarray:
+        """Boolean ``(height, width)`` membership mask clipped to the grid."""
+
+        mask = self.mask_for(self.shape)
+        mask.setflags(write=False)
+        return mask
+
+    def mask_for(self, shape: tuple[int, int]) -> np.ndarray:
+        """Boolean membership mask for a grid of ``shape``, dropping pixels outside it."""
+
+        height, width = shape
+        xs, ys = self.pixels.T
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        mask = np.zeros(shape, dtype=bool)
+        mask[ys[inside], xs[inside]] = True
+        return mask
 
     def translated(self, dx: int, dy: int) -> "Object":
-        moved = frozenset((x + dx, y + dy) for x, y in self.pixels)
+        moved = self.pixels + np.array([dx, dy], dtype=self.pixels.dtype)
+        moved.setflags(write=False)
         left, top, right, bottom = self.bounding_box
         bbox = (left + dx, top + dy, right + dx, bottom + dy)
         ax, ay = self.anchor
-        return Object(moved, self.colors, bbox, (ax + dx, ay + dy))
+        return Object(moved, self.color_sig, bbox, (ax + dx, ay + dy), self.shape)
+
+
+_FOUR_CONNECTED = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]], dtype=bool)
 
 
-def _neighbors(x: int, y: int) -> Iterable[Coordinate]:
-    yield x + 1, y
-    yield x - 1, y
-    yield x, y + 1
-    yield x, y - 1
+def _label_components(arr: np.ndarray, background: int | None) -> tuple[np.ndarray, int]:
+    """Label 4-connected non-background pixels of ``arr`` starting from 1."""
+
+    if background is None:
+        mask = np.ones(arr.shape, dtype=bool)
+    else:
+        mask = arr != background
+    labels, count = ndimage.label(mask, structure=_FOUR_CONNECTED)
+    return labels, int(count)
 
 
 def extract_objects(grid: Grid, background: int | None = None) -> list[Object]:
@@ -39,47 +80,29 @@ def extract_objects(grid: Grid, background: int | None = None) -> list[Object]:
     ``background`` may contain a colour that should be ignored when forming objects.
     """
 
-    visited: set[Coordinate] = set()
+    arr = grid._arr
+    labels, count = _label_components(arr, background)
+    if count == 0:
+        return []
+    flat_labels = labels.ravel()
+    order = np.argsort(flat_labels, kind="stable")
+    bounds = np.searchsorted(flat_labels[order], np.arange(1, count + 2))
+    ys, xs = np.divmod(order, arr.shape[1])
+    values = arr.ravel()[order]
     objects: list[Object] = []
-    bg = background
-    for (x, y), value in grid.cells():
-        if (x, y) in visited:
-            continue
-        if bg is not None and value == bg:
-            visited.add((x, y))
-            continue
-        queue: deque[Coordinate] = deque([(x, y)])
-        pixels: set[Coordinate] = set()
-        counter: Counter = Counter()
-        left = right = x
-        top = bottom = y
-        while queue:
-            cx, cy = queue.popleft()
-            if (cx, cy) in visited:
-                continue
-            visited.add((cx, cy))
-            cv = grid.get(cx, cy)
-            if bg is not None and cv == bg:
-                continue
-            pixels.add((cx, cy))
-            counter[cv] += 1
-            left = min(left, cx)
-            right = max(right, cx)
-            top = min(top, cy)
-            bottom = max(bottom, cy)
-            for nx, ny in _neighbors(cx, cy):
-                if 0 <= nx < grid.width and 0 <= ny < grid.height and (nx, ny) not in visited:
-                    queue.append((nx, ny))
-        if pixels:
-            anchor = (left, top)
-            objects.append(
-                Object(
-                    pixels=frozenset(pixels),
-                    colors=counter,
-                    bounding_box=(left, top, right + 1, bottom + 1),
-                    anchor=anchor,
-                )
+    for index, (rows, cols) in enumerate(ndimage.find_objects(labels)):
+        start, stop = bounds[index], bounds[index + 1]
+        pixels = np.column_stack((xs[start:stop], ys[start:stop])).astype(np.int16)
+        pixels.setflags(write=False)
+        objects.append(
+            Object(
+                pixels=pixels,
+                color_sig=np.bincount(values[start:stop], minlength=10).tobytes(),
+                bounding_box=(cols.start, rows.start, cols.stop, rows.stop),
+                anchor=(cols.start, rows.start),
+                shape=arr.shape,
             )
+        )
     return objects
 
 
@@ -87,49 +110,62 @@ def object_grid(grid: Grid, obj: Object, fill: int | None = None) -> Grid:
     left, top, right, bottom = obj.bounding_box
     width = right - left
     height = bottom - top
-    rows = [[fill if fill is not None else grid.most_common_color() for _ in range(width)] for _ in range(height)]
-    for x, y in obj.pixels:
-        rows[y - top][x - left] = grid.get(x, y)
-    return Grid.from_list(rows)
+    canvas = np.full((height, width), fill if fill is not None else grid.most_common_color())
+    xs, ys = obj.pixels.T
+    canvas[ys - top, xs - left] = grid._arr[ys, xs]
+    return Grid(canvas)
 
 
 def translate(grid: Grid, obj: Object, dx: int, dy: int, background: int) -> Grid:
-    canvas = [[background for _ in range(grid.width)] for _ in range(grid.height)]
-    for (x, y), value in grid.cells():
-        if (x, y) not in obj.pixels:
-            canvas[y][x] = value
-    for x, y in obj.pixels:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < grid.width and 0 <= ny < grid.height:
-            canvas[ny][nx] = grid.get(x, y)
-    return Grid.from_list(canvas)
+    """Move ``obj`` by ``(dx, dy)`` leaving ``background`` where it used to be.
+
+    ``obj`` may come from a grid of another size; only its pixels that fall
+    inside ``grid`` are moved.
+    """
+
+    arr = grid._arr
+    mask = obj.mask if obj.shape == arr.shape else obj.mask_for(arr.shape)
+    canvas = np.where(mask, np.uint8(background), arr)
+    height, width = arr.shape
+    if abs(dx) < width and abs(dy) < height:
+        src = (slice(max(0, -dy), height - max(0, dy)), slice(max(0, -dx), width - max(0, dx)))
+        dst = (slice(max(0, dy), height - max(0, -dy)), slice(max(0, dx), width - max(0, -dx)))
+        moved = mask[src]
+        canvas[dst][moved] = arr[src][moved]
+    return Grid._from_array(canvas)
 
 
 def centroid(obj: Object) -> tuple[float, float]:
-    xs = [x for x, _ in obj.pixels]
-    ys = [y for _, y in obj.pixels]
-    return sum(xs) / len(xs), sum(ys) / len(ys)
+    x, y = obj.pixels.mean(axis=0).tolist()
+    return x, y
 
 
 def objects_match(a: Object, b: Object) -> bool:
-    return a.colors == b.colors and len(a.pixels) == len(b.pixels)
+    return a.color_sig == b.color_sig and len(a.pixels) == len(b.pixels)
 
 
 def translate_vector(a: Object, b: Object) -> tuple[int, int]:
-    ax, ay = centroid(a)
-    bx, by = centroid(b)
-    return round(bx - ax), round(by - ay)
+    dx, dy = np.round(b.pixels.mean(axis=0) - a.pixels.mean(axis=0)).astype(int).tolist()
+    return dx, dy
+
+
+_Signature = tuple[bytes, int]
+
+
+def _match_signature(obj: Object) -> _Signature:
+    return obj.color_sig, len(obj.pixels)
 
 
 def difference_objects(source: Sequence[Object], target: Sequence[Object]) -> list[tuple[Object, Object, tuple[int, int]]]:
+    """Pair each source object with the first unclaimed matching target object."""
+
+    candidates: defaultdict[_Signature, deque[Object]] = defaultdict(deque)
+    for candidate in target:
+        candidates[_match_signature(candidate)].append(candidate)
     matches: list[tuple[Object, Object, tuple[int, int]]] = []
     for obj in source:
-        best: tuple[Object, tuple[int, int]] | None = None
-        for candidate in target:
-            if objects_match(obj, candidate):
-                dx, dy = translate_vector(obj, candidate)
-                best = (candidate, (dx, dy))
-                break
-        if best:
-            matches.append((obj, best[0], best[1]))
+        pending = candidates.get(_match_signature(obj))
+        if pending:
+            candidate = pending.popleft()
+            matches.append((obj, candidate, translate_vector(obj, candidate)))
     return matches
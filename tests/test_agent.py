@@ -1,5 +1,6 @@
 from arcagi2.agent import ArcSolverAgent, Task
 from arcagi2.grid import Grid
+from arcagi2.heuristics import Heuristic
 
 
 def build_task(training, tests):
@@ -51,6 +52,20 @@ def test_colour_mapping_heuristic():
     assert mapping_candidate.outputs[0].equals(Grid.from_list([[2, 3]]))
 
 
+def test_colour_mapping_rationale_keeps_first_seen_order():
+    task = build_task(
+        training=[(
+            [[3, 1, 2]],
+            [[4, 5, 6]],
+        )],
+        tests=[[[1, 2, 3]]],
+    )
+    agent = ArcSolverAgent()
+    candidates = agent.analyse(task)
+    mapping_candidate = next(c for c in candidates if c.heuristic == "colour-mapping")
+    assert "{3: 4, 1: 5, 2: 6}" in mapping_candidate.rationale
+
+
 def test_translation_heuristic():
     task = build_task(
         training=[(
@@ -79,3 +94,71 @@ def test_scale_replication_heuristic():
     assert scale_candidate.outputs[0].equals(
         Grid.from_list([[1, 1, 2, 2], [1, 1, 2, 2], [3, 3, 4, 4], [3, 3, 4, 4]])
     )
+
+
+def test_background_colour_heuristic():
+    task = build_task(
+        training=[(
+            [[0, 0, 1], [0, 2, 0], [0, 0, 0]],
+            [[5, 5, 7], [5, 7, 5], [5, 5, 5]],
+        )],
+        tests=[[[0, 3], [0, 0]]],
+    )
+    agent = ArcSolverAgent()
+    candidates = agent.analyse(task)
+    background_candidate = next(c for c in candidates if c.heuristic == "background-colour")
+    assert background_candidate.outputs[0].equals(Grid.from_list([[5, 7], [5, 5]]))
+
+
+def test_background_colour_ties_use_first_colour():
+    task = build_task(
+        training=[(
+            [[1, 3]],
+            [[6, 4]],
+        )],
+        tests=[[[1, 3]]],
+    )
+    agent = ArcSolverAgent()
+    candidates = agent.analyse(task)
+    background_candidate = next(c for c in candidates if c.heuristic == "background-colour")
+    assert "1->6" in background_candidate.rationale
+    assert background_candidate.outputs[0].equals(Grid.from_list([[6, 4]]))
+
+
+def test_custom_heuristic_without_features_argument():
+    class SwapColours(Heuristic):
+        name = "swap"
+
+        def infer(self, pairs):
+            return self._success(lambda grid: grid.replace_color(1, 2), 0.9, "Swap 1 for 2.")
+
+    task = build_task(
+        training=[(
+            [[1]],
+            [[2]],
+        )],
+        tests=[[[1, 0]]],
+    )
+    agent = ArcSolverAgent(heuristics=[SwapColours()])
+    candidates = agent.analyse(task)
+    assert candidates[0].heuristic == "swap"
+    assert candidates[0].outputs[0].equals(Grid.from_list([[2, 0]]))
+
+
+def test_translation_applies_to_each_test_grid():
+    task = build_task(
+        training=[(
+            [[2, 0, 0], [0, 0, 0], [0, 0, 0]],
+            [[0, 0, 0], [0, 2, 0], [0, 0, 0]],
+        )],
+        tests=[
+            [[0, 0, 0], [2, 0, 0], [0, 0, 0]],
+            [[0, 4, 0], [0, 0, 0], [0, 0, 0]],
+        ],
+    )
+    agent = ArcSolverAgent()
+    candidates = agent.analyse(task)
+    translation_candidate = next(c for c in candidates if c.heuristic == "object-translation")
+    first, second = translation_candidate.outputs
+    assert first.equals(Grid.from_list([[0, 0, 0], [0, 0, 0], [0, 2, 0]]))
+    assert second.equals(Grid.from_list([[0, 0, 0], [0, 0, 4], [0, 0, 0]]))
@@ -0,0 +1,105 @@
+import pytest
+
+from arcagi2.grid import Grid
+
+
+def test_transforms_match_nested_layout():
+    grid = Grid.from_list([[1, 2, 3], [4, 5, 6]])
+    assert grid.transpose().to_list() == [[1, 4], [2, 5], [3, 6]]
+    assert grid.mirror_horizontal().to_list() == [[3, 2, 1], [6, 5, 4]]
+    assert grid.mirror_vertical().to_list() == [[4, 5, 6], [1, 2, 3]]
+    assert grid.rotate_right().to_list() == [[4, 1], [5, 2], [6, 3]]
+    assert grid.resize(2, 1).to_list() == [[1, 1, 2, 2, 3, 3], [4, 4, 5, 5, 6, 6]]
+    assert grid.data == ((1, 2, 3), (4, 5, 6))
+
+
+def test_statistics_and_difference():
+    grid = Grid.from_list([[0, 0, 1], [0, 2, 1]])
+    assert grid.count(0) == 3
+    assert grid.colors() == {0, 1, 2}
+    assert grid.most_common_color() == 0
+    assert grid.flatten() == (0, 0, 1, 0, 2, 1)
+    assert grid.difference(grid.set(2, 1, 5)) == [((2, 1), 1, 5)]
+
+
+def test_most_common_color_ties_follow_raster_order():
+    assert Grid.from_list([[1, 3]]).most_common_color() == 1
+    assert Grid.from_list([[3, 1]]).most_common_color() == 3
+    assert Grid.from_list([[5, 2], [2, 5]]).most_common_color() == 5
+    assert Grid.from_list([[4, 0, 0, 4, 4]]).most_common_color() == 4
+
+
+def test_equality_and_hashing():
+    grid = Grid.from_list([[1, 2], [3, 4]])
+    assert grid == Grid.from_list([[1, 2], [3, 4]])
+    assert hash(grid) == hash(Grid.from_list([[1, 2], [3, 4]]))
+    assert grid != grid.transpose()
+
+
+@pytest.mark.parametrize(
+    ("data", "error"),
+    [
+        ([], ValueError),
+        ([[1], [1, 2]], ValueError),
+        ([[-1]], ValueError),
+        ([[256]], ValueError),
+        ([["x"]], ValueError),
+    ],
+)
+def test_invalid_grids_are_rejected(data, error):
+    with pytest.raises(error):
+        Grid.from_list(data)
+
+
+def test_from_list_coerces_values_with_int():
+    assert Grid.from_list([[1.0, True], ["3", 1.5]]).to_list() == [[1, 1], [3, 1]]
+    with pytest.raises(TypeError):
+        Grid([[1.5]])
+
+
+def test_map_colors_with_default():
+    grid = Grid.from_list([[0, 1], [2, 0]])
+    assert grid.map_colors({1: 7}).to_list() == [[0, 7], [2, 0]]
+    assert grid.map_colors({0: 5}, default=9).to_list() == [[5, 9], [9, 5]]
+    assert grid.replace_color(0, 3).to_list() == [[3, 1], [2, 3]]
+
+
+def test_bounding_box_and_cells():
+    grid = Grid.from_list([[0, 0, 0], [0, 4, 0], [0, 0, 4]])
+    assert grid.bounding_box([4]) == (1, 1, 3, 3)
+    assert grid.bounding_box([7]) is None
+    assert grid.bounding_box() == (0, 0, 3, 3)
+    assert list(grid.cells())[4] == ((1, 1), 4)
+
+
+def test_grid_is_immutable():
+    grid = Grid.from_list([[1, 2]])
+    with pytest.raises(AttributeError):
+        grid._arr = None
+    with pytest.raises(ValueError):
+        grid._arr[0, 0] = 3
+    assert grid.set(0, 0, 3).to_list() == [[3, 2]]
+    assert grid.to_list() == [[1, 2]]
+
+
+@pytest.mark.parametrize(
+    ("offset", "expected"),
+    [
+        ((1, 1), [[0, 0, 0], [0, 7, 8], [0, 9, 6]]),
+        ((-1, 0), [[8, 0, 0], [6, 0, 0], [0, 0, 0]]),
+        ((2, 2), [[0, 0, 0], [0, 0, 0], [0, 0, 7]]),
+        ((5, 0), [[0, 0, 0], [0, 0, 0], [0, 0, 0]]),
+    ],
+)
+def test_paste_clips_to_canvas(offset, expected):
+    canvas = Grid.from_list([[0, 0, 0], [0, 0, 0], [0, 0, 0]])
+    patch = Grid.from_list([[7, 8], [9, 6]])
+    assert canvas.paste(patch, offset).to_list() == expected
+
+
+def test_resize_scales_each_axis():
+    grid = Grid.from_list([[1, 2]])
+    assert grid.resize(1, 1) is grid
+    assert grid.resize(3, 2).to_list() == [[1, 1, 1, 2, 2, 2], [1, 1, 1, 2, 2, 2]]
+    with pytest.raises(ValueError):
+        grid.resize(0, 2)
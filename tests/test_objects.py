@@ -0,0 +1,48 @@
+from arcagi2.grid import Grid
+from arcagi2.objects import centroid, difference_objects, extract_objects, translate, translate_vector
+
+
+def test_extract_objects_uses_four_connectivity():
+    grid = Grid.from_list([[1, 0, 2], [1, 0, 2], [0, 3, 3]])
+    objects = extract_objects(grid, background=0)
+    assert [obj.bounding_box for obj in objects] == [(0, 0, 1, 2), (1, 0, 3, 3)]
+    assert objects[0].pixels.tolist() == [[0, 0], [0, 1]]
+    assert objects[0].mask.tolist() == [[True, False, False], [True, False, False], [False, False, False]]
+    assert objects[1].colors == {2: 2, 3: 2}
+    assert objects[1].anchor == (1, 0)
+
+
+def test_extract_objects_without_background_spans_grid():
+    grid = Grid.from_list([[1, 0], [0, 2]])
+    objects = extract_objects(grid)
+    assert len(objects) == 1
+    assert objects[0].bounding_box == (0, 0, 2, 2)
+
+
+def test_translate_moves_object_pixels():
+    grid = Grid.from_list([[3, 3, 0], [0, 0, 0], [0, 0, 0]])
+    obj = extract_objects(grid, background=0)[0]
+    moved = obj.translated(1, 2)
+    assert moved.pixels.tolist() == [[1, 2], [2, 2]]
+    assert centroid(moved) == (1.5, 2.0)
+    assert translate_vector(obj, moved) == (1, 2)
+    assert translate(grid, obj, 1, 2, background=0).to_list() == [[0, 0, 0], [0, 0, 0], [0, 3, 3]]
+
+
+def test_difference_objects_claims_each_target_once():
+    source = extract_objects(Grid.from_list([[5, 0, 5], [0, 0, 0]]), background=0)
+    target = extract_objects(Grid.from_list([[0, 0, 0], [5, 0, 0]]), background=0)
+    matches = difference_objects(source, target)
+    assert len(matches) == 1
+    obj, candidate, vector = matches[0]
+    assert obj is source[0] and candidate is target[0]
+    assert vector == (0, 1)
+
+
+def test_translate_accepts_object_from_differently_sized_grid():
+    source = Grid.from_list([[3, 0, 0], [0, 0, 0], [0, 0, 0]])
+    obj = extract_objects(source, background=0)[0]
+    target = Grid.from_list([[3, 0], [0, 0]])
+    assert translate(target, obj, 1, 1, background=0).to_list() == [[0, 0], [0, 3]]
+    far = obj.translated(2, 2)
+    assert translate(target, far, -1, 0, background=0).to_list() == [[3, 0], [0, 0]]